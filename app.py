@@ -1,39 +1,60 @@
 import streamlit as st
-import random
-import matplotlib.pyplot as plt
-import statistics
+import numpy as np
+import pandas as pd
+
+from sync_core import BASE_TIME, NodeArray, get_times, berkeley_sync, cristian_sync
 
 # ===== CONFIG =====
-NUM_NODES = 5
-BASE_TIME = 1000.0
-
-class Node:
-    def __init__(self, node_id, drift=1.0, is_byzantine=False):
-        self.node_id = node_id
-        self.drift = drift
-        self.is_byzantine = is_byzantine
-        self.offset = 0.0
-
-    def get_time(self, base_time=BASE_TIME):
-        t = base_time * self.drift + self.offset
-        return t + 30.0 if self.is_byzantine else t
-
-    def adjust(self, offset):
-        self.offset += offset
-
-# ===== ALGORITHMS =====
-def berkeley_sync(nodes, use_median=False):
-    readings = [n.get_time() for n in nodes]
-    central = statistics.median(readings) if use_median else sum(readings) / len(readings)
-    for node, r in zip(nodes, readings):
-        node.adjust(central - r)
-
-def cristian_sync(clients, server):
-    for client in clients:
-        server_time = server.get_time()
-        if server.is_byzantine:
-            server_time += 30.0
-        client.adjust(server_time - client.get_time())
+MAX_PLOT_NODES = 200  # downsample the chart beyond this
+MAX_MANUAL_NODES = 20  # one widget per node, so keep manual mode small
+
+# ===== SIMULATION =====
+@st.cache_data(show_spinner=False)
+def run_sim(algorithm, fault_type, use_robust, manual_times, seed, num_nodes):
+    """Build node state, run the chosen algorithm, return (before, after) times.
+
+    Cached on its arguments, so re-rendering with identical settings is a
+    dictionary lookup instead of a fresh RNG + sync run.
+    """
+    if manual_times is not None:
+        # Manual mode: fixed initial time
+        drifts = np.ones(num_nodes)
+        offsets = np.asarray(manual_times, dtype=np.float64) - BASE_TIME
+    else:
+        # Random drift mode
+        rng = np.random.default_rng(seed)
+        drifts = rng.uniform(0.99, 1.01, num_nodes)
+        offsets = np.zeros(num_nodes)
+
+    if fault_type == "Byzantine Node":
+        offsets[0] += 30.0  # constant lie, folded in once
+
+    arr = NodeArray(drifts, offsets)
+    before_times = get_times(arr)
+
+    if algorithm == "Berkeley":
+        # Slices are views, so adjustments land in the full array
+        active = NodeArray(arr.drifts[1:],
+                           arr.offsets[1:]) if fault_type == "Crash" else arr
+        berkeley_sync(active, use_median=use_robust)
+    else:  # Cristian
+        first_client = 2 if fault_type == "Crash" else 1  # skip crashed client
+        cristian_sync(arr, first_client=first_client)
+
+    after_times = get_times(arr)
+    return before_times, after_times
+
+@st.cache_data(show_spinner=False)
+def plot_labels(num_nodes):
+    """Chart indices and axis labels, built once per node count.
+
+    Would be a module constant, but the node count is user-configurable.
+    """
+    if num_nodes > MAX_PLOT_NODES:
+        idx = np.linspace(0, num_nodes - 1, MAX_PLOT_NODES, dtype=int)
+    else:
+        idx = np.arange(num_nodes)
+    return idx, [f"Node {i}" for i in idx]
 
 # ===== STREAMLIT APP =====
 st.set_page_config(page_title="Clock Sync Demo", layout="centered")
@@ -48,53 +69,31 @@ st.sidebar.header("⚙️ Simulation Settings")
 algorithm = st.sidebar.selectbox("Algorithm", ["Berkeley", "Cristian"])
 fault_type = st.sidebar.selectbox("Fault Type", ["None", "Byzantine Node"])
 use_robust = st.sidebar.checkbox("Use Robust Mode (Median for Berkeley)")
+NUM_NODES = st.sidebar.slider("Nodes", 5, 100000, 5, step=5)
 
 # Input method
 input_method = st.sidebar.radio("Clock Initialization", ["Random Drift", "Manual Input"])
 
 if input_method == "Manual Input":
+    if NUM_NODES > MAX_MANUAL_NODES:
+        st.sidebar.warning(f"Manual input supports at most {MAX_MANUAL_NODES} "
+                           f"nodes; clamping from {NUM_NODES}.")
+        NUM_NODES = MAX_MANUAL_NODES
     st.sidebar.markdown("### Set Initial Clocks (seconds)")
-    manual_times = []
+    manual_times = np.empty(NUM_NODES)
     for i in range(NUM_NODES):
-        val = st.sidebar.number_input(f"Node {i}", value=1000.0, step=1.0, key=f"node_{i}")
-        manual_times.append(val)
+        manual_times[i] = st.sidebar.number_input(f"Node {i}", value=1000.0, step=1.0, key=f"node_{i}")
+    seed = 0
 else:
     manual_times = None
+    seed = st.sidebar.number_input("Random Seed", value=0, step=1)
 
 # Run Simulation
 if st.sidebar.button("▶ Run Simulation"):
-    nodes = []
-    byzantine_id = 0 if fault_type == "Byzantine Node" else -1
-
-    for i in range(NUM_NODES):
-        if manual_times is not None:
-            # Manual mode: fixed initial time
-            node = Node(i, drift=1.0, is_byzantine=(i == byzantine_id))
-            node.offset = manual_times[i] - BASE_TIME
-        else:
-            # Random drift mode
-            drift = random.uniform(0.99, 1.01)
-            node = Node(i, drift=drift, is_byzantine=(i == byzantine_id))
-        nodes.append(node)
-
-    # Measure before sync
-    before_times = [n.get_time() for n in nodes]
-    skew_before = max(before_times) - min(before_times)
-
-    # Run selected algorithm
-    if algorithm == "Berkeley":
-        active_nodes = nodes[1:] if fault_type == "Crash" else nodes
-        berkeley_sync(active_nodes, use_median=use_robust)
-    else:  # Cristian
-        server = nodes[0]
-        clients = nodes[1:]
-        if fault_type == "Crash":
-            clients = nodes[2:]  # skip crashed client
-        cristian_sync(clients, server)
-
-    # Measure after sync
-    after_times = [n.get_time() for n in nodes]
-    skew_after = max(after_times) - min(after_times)
+    before_times, after_times = run_sim(algorithm, fault_type, use_robust,
+                                        manual_times, seed, NUM_NODES)
+    skew_before = np.ptp(before_times)
+    skew_after = np.ptp(after_times)
 
     # ===== FEATURE: SYNCHRONIZATION STATUS =====
     st.subheader("⏱️ Clock Synchronization Status")
@@ -109,16 +108,11 @@ if st.sidebar.button("▶ Run Simulation"):
     col1.metric("Skew Before Sync", f"{skew_before:.4f} sec")
     col2.metric("Skew After Sync", f"{skew_after:.4f} sec")
 
-    # Plot
-    fig, ax = plt.subplots(figsize=(10, 4))
-    node_ids = [f"Node {n.node_id}" for n in nodes]
-    ax.plot(node_ids, before_times, 'ro-', label='Before Sync')
-    ax.plot(node_ids, after_times, 'go-', label='After Sync')
-    ax.set_ylabel("Clock Time (seconds)")
-    ax.set_title("Clock Values Across Nodes")
-    ax.legend()
-    ax.grid(True)
-    st.pyplot(fig)
+    # Plot (Vega-Lite renders client-side; no server-side rasterization)
+    idx, node_ids = plot_labels(NUM_NODES)
+    chart_data = pd.DataFrame({"Before Sync": before_times[idx],
+                               "After Sync": after_times[idx]}, index=node_ids)
+    st.line_chart(chart_data)
 
     # Explanations
     if fault_type == "Byzantine Node":
@@ -0,0 +1,59 @@
+"""Numeric core for the clock-sync demo: node state and sync kernels.
+
+Lives outside app.py so Streamlit's per-interaction script reruns don't
+rebuild the Numba dispatchers or repeat the JIT warm-up — module imports
+are cached in sys.modules across reruns.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to plain NumPy
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+BASE_TIME = 1000.0
+
+@dataclass
+class NodeArray:
+    """Structure-of-Arrays node state: one contiguous array per field.
+
+    The Byzantine +30s lie is folded into ``offsets`` at construction, so
+    the reading path is branchless.
+    """
+    drifts: np.ndarray
+    offsets: np.ndarray
+
+def get_times(arr, base_time=BASE_TIME):
+    return base_time * arr.drifts + arr.offsets
+
+@njit(cache=True)
+def _berkeley_core(drifts, offsets, use_median):
+    readings = BASE_TIME * drifts + offsets
+    central = np.median(readings) if use_median else readings.mean()
+    offsets += central - readings
+
+@njit(cache=True)
+def _cristian_core(drifts, offsets, first_client):
+    server_time = BASE_TIME * drifts[0] + offsets[0]  # invariant: read once
+    client_times = BASE_TIME * drifts[first_client:] + offsets[first_client:]
+    offsets[first_client:] += server_time - client_times
+
+def berkeley_sync(arr, use_median=False):
+    """Vectorized Berkeley: one ufunc pass each for readings, central, adjust."""
+    _berkeley_core(arr.drifts, arr.offsets, use_median)
+
+def cristian_sync(arr, first_client=1):
+    """Cristian's: node 0 is the time server, the rest are clients."""
+    _cristian_core(arr.drifts, arr.offsets, first_client)
+
+# Warm the JIT at import so the first "Run Simulation" isn't paying for
+# compilation (no-op under the plain-NumPy fallback). Runs once per
+# process, not once per Streamlit rerun.
+_berkeley_core(np.ones(1), np.zeros(1), True)
+_berkeley_core(np.ones(1), np.zeros(1), False)
+_cristian_core(np.ones(1), np.zeros(1), 1)